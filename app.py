@@ -1,46 +1,121 @@
-import json
+import gzip
+import hashlib
+import mmap
+import os
+import re
 from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, FrozenSet, List, Optional, Tuple
 
-from fastapi import FastAPI, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+import orjson
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
 from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.middleware.gzip import GZipResponder
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 APP_TITLE = "Global CFM AsyncAPI Explorer"
 DATA_PATH = Path(__file__).parent / "Global_CFM.json"
-
-app = FastAPI(title=APP_TITLE)
-
-# CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+GZIP_MIN_SIZE = 1024
+
+def _env_int(name: str, default: int) -> int:
+    """Non-negative integer setting from the environment; negative values clamp to 0."""
+    raw = os.environ.get(name)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        return max(0, int(raw))
+    except ValueError:
+        raise ValueError(f"{name} must be an integer, got {raw!r}") from None
+
+# $ref expansion depth and per-object attribute cap for resolved payloads.
+# Cycles stop at the first repeated ancestor, but payloads still grow quickly
+# with depth (about 1.3 MiB total at depth 2, 3.9 MiB at 5 for the sample document).
+MAX_DEPTH = _env_int("SCHEMA_MAX_DEPTH", 2)
+MAX_ATTRS = _env_int("SCHEMA_MAX_ATTRS", 500)
+
+app = FastAPI(title=APP_TITLE, default_response_class=ORJSONResponse)
+
+# CORS: the API is public and read-only, so every response gets a wildcard
+# origin and preflights are answered without reaching the router.
+_PREFLIGHT_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "GET, HEAD, OPTIONS",
+    "Access-Control-Allow-Headers": "*",
+    "Access-Control-Max-Age": "600",
+}
+
+class PublicCORSMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if scope["method"] == "OPTIONS":
+            await Response(status_code=204, headers=_PREFLIGHT_HEADERS)(scope, receive, send)
+            return
+
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("Access-Control-Allow-Origin", "*")
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+app.add_middleware(PublicCORSMiddleware)
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Whether Accept-Encoding allows gzip, honouring q-values (gzip;q=0 refuses it)."""
+    qvalues: Dict[str, float] = {}
+    for token in accept_encoding.split(","):
+        coding, _, params = token.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qvalues[coding] = q
+    q = qvalues.get("gzip", qvalues.get("x-gzip", qvalues.get("*", 0.0)))
+    return q > 0
+
+class NegotiatedGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that decides with accepts_gzip, like the pre-compressed payloads."""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and accepts_gzip(Headers(scope=scope).get("accept-encoding", "")):
+            responder = GZipResponder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+            await responder(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+# Compression for dynamic responses; compiled payloads are gzipped once at startup
+app.add_middleware(NegotiatedGZipMiddleware, minimum_size=GZIP_MIN_SIZE, compresslevel=5)
 
 # ---------- Helpers ----------
-def deep_get(d: Dict[str, Any], path: List[str], default=None):
-    cur = d
-    for p in path:
-        if not isinstance(cur, dict) or p not in cur:
-            return default
-        cur = cur[p]
-    return cur
-
+@lru_cache(maxsize=1)
 def read_json() -> Dict[str, Any]:
     if not DATA_PATH.exists():
         raise FileNotFoundError(f"Global_CFM.json not found at {DATA_PATH}")
-    with open(DATA_PATH, "r", encoding="utf-8") as f:
-        return json.load(f)
+    # Parse straight from the mapped file; no intermediate copy of its contents
+    with open(DATA_PATH, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        with memoryview(mm) as view:
+            return orjson.loads(view)
 
 @lru_cache(maxsize=1)
 def get_components() -> Dict[str, Any]:
     data = read_json()
-    comps = deep_get(data, ["components", "schemas"], {}) or {}
+    comps = (data.get("components") or {}).get("schemas") or {}
     if not isinstance(comps, dict):
         comps = {}
     return comps
@@ -63,6 +138,7 @@ def as_str_list(v) -> List[str]:
         return [str(x) for x in v]
     return [str(v)]
 
+@lru_cache(maxsize=8192)
 def clean_name(name: str) -> str:
     if not isinstance(name, str):
         return ""
@@ -71,135 +147,130 @@ def clean_name(name: str) -> str:
         if name.startswith(p):
             name = name[len(p):]
             break
-    words = []
-    current = ""
-    for c in name:
-        if c.isupper() and current:
-            words.append(current)
-            current = c
-        else:
-            current += c
-    if current:
-        words.append(current)
-    return "".join(word.capitalize() for word in words)
+    # A word starts at every uppercase character (str.isupper, so not just ASCII)
+    bounds = [i for i, c in enumerate(name) if i and c.isupper()]
+    return "".join(name[a:b].capitalize() for a, b in zip([0] + bounds, bounds + [len(name)]))
 
 # ---------- Schema resolution ----------
-def resolve_schema(schema_name: str, visited: Optional[Tuple[str, ...]] = None, depth: int = 0) -> Dict[str, Any]:
-    visited = visited or tuple()
+_COLLAPSED_REF_TEMPLATE = {"type": "object", "description": "Reference (collapsed)", "examples": []}
+
+def resolve_schema(schema_name: str, visited: Optional[FrozenSet[str]] = None, depth: int = 0) -> Dict[str, Any]:
+    visited = visited or frozenset()
     if schema_name in visited:
-        return {"title": schema_name, "type": "object", "description": f"Circular reference: {' → '.join(visited + (schema_name,))}", "attributes": []}
+        return {"title": schema_name, "type": "object", "description": f"Circular reference: {' → '.join(sorted(visited) + [schema_name])}", "attributes": ()}
+    # Only ancestors the subtree can still reach affect the result; dropping the
+    # rest lets schemas resolved under different paths share a cache entry.
+    return _resolve_core(schema_name, visited & _reachable(schema_name, MAX_DEPTH - depth), depth)
+
+def _ref_children(ref: str, ancestors: FrozenSet[str], depth: int) -> Tuple[Dict[str, Any], ...]:
+    if depth < MAX_DEPTH:
+        return resolve_schema(ref, ancestors, depth + 1).get("attributes", ())
+    return ({"name": f"(ref) {ref}", **_COLLAPSED_REF_TEMPLATE},)
+
+def _truncated_row(hidden: int) -> Dict[str, Any]:
+    return {
+        "name": "(truncated)",
+        "type": "object",
+        "description": f"{hidden} more attributes not shown.",
+        "examples": [],
+        "children": []
+    }
+
+def _nested_attrs(props: Dict[str, Any], ancestors: FrozenSet[str], depth: int) -> List[Dict[str, Any]]:
+    rows = [_attr(subname, subnode, ancestors, depth) for subname, subnode in islice(props.items(), MAX_ATTRS)]
+    if len(props) > MAX_ATTRS:
+        rows.append(_truncated_row(len(props) - MAX_ATTRS))
+    return rows
+
+def _attr(name: str, node: Dict[str, Any], ancestors: FrozenSet[str], depth: int, top_level: bool = False) -> Dict[str, Any]:
+    """One attribute row. A $ref or array-of-$ref node gets the referenced schema's attributes as children.
+
+    Top-level properties keep their declared type for a direct $ref, do not expand
+    inline properties, and do expand the properties of inline array items; nested
+    attributes do the opposite.
+    """
+    ntype = node.get("type")
+    ref = node.get("$ref")
+    examples = node.get("examples") or []
+    ptype = ntype if top_level else node.get("type", "object")
+    children: List[Dict[str, Any]] = []
+
+    if ref:
+        r = ref_name(ref)
+        children.extend(_ref_children(r, ancestors, depth))
+        if not top_level:
+            ptype = r
+
+    if not top_level:
+        children.extend(_nested_attrs(node.get("properties") or {}, ancestors, depth))
+
+    if ntype == "array" or ptype == "array":
+        items = node.get("items") or {}
+        iref = items.get("$ref")
+        if iref:
+            r = ref_name(iref)
+            ptype = f"array of {r}"
+            children = list(_ref_children(r, ancestors, depth))
+        else:
+            ptype = f"array of {items.get('type', 'object')}"
+            if top_level:
+                children.extend(_nested_attrs(items.get("properties") or {}, ancestors, depth))
+
+    if top_level:
+        ptype = ptype or "object"
+
+    return {
+        "name": clean_name(name),
+        "type": ptype,
+        "description": normalize_desc(node.get("description"), name),
+        "examples": examples if isinstance(examples, list) else [examples],
+        "children": tuple(children)
+    }
 
+@lru_cache(maxsize=None)
+def _resolve_core(schema_name: str, visited: FrozenSet[str], depth: int) -> Dict[str, Any]:
+    """Resolve one schema under a given set of ancestors and depth.
+
+    Results are shared between callers, so attribute and children sequences are
+    tuples; copy them before adding anything.
+    """
     comps = get_components()
     raw = comps.get(schema_name)
     if raw is None:
-        return {"title": schema_name, "type": "object", "description": f"Unknown schema '{schema_name}'.", "attributes": []}
+        return {"title": schema_name, "type": "object", "description": f"Unknown schema '{schema_name}'.", "attributes": ()}
 
     title = raw.get("title", schema_name)
     stype = raw.get("type", "object")
     desc = normalize_desc(raw.get("description"), title)
     attrs: List[Dict[str, Any]] = []
 
-    def add_property(name: str, node: Dict[str, Any]):
-        ptype = node.get("type")
-        examples = node.get("examples") or []
-        description = normalize_desc(node.get("description"), name)
-        children = []
-
-        if "$ref" in node:
-            ref = ref_name(node["$ref"])
-            if depth < 2:
-                child = resolve_schema(ref, visited + (schema_name,), depth + 1)
-                children = child.get("attributes", [])
-            else:
-                children = [{"name": f"(ref) {ref}", "type": "object", "description": "Reference (collapsed)", "examples": []}]
-
-        if ptype == "array":
-            items = node.get("items", {})
-            if "$ref" in items:
-                iref = ref_name(items["$ref"])
-                ptype = f"array of {iref}"
-                if depth < 2:
-                    child = resolve_schema(iref, visited + (schema_name,), depth + 1)
-                    children = child.get("attributes", [])
-                else:
-                    children = [{"name": f"(ref) {iref}", "type": "object", "description": "Reference (collapsed)", "examples": []}]
-            else:
-                ptype = f"array of {items.get('type','object')}"
-                if isinstance(items, dict) and items.get("properties"):
-                    for subname, subnode in items.get("properties").items():
-                        children.append(build_attr(subname, subnode, schema_name, visited, depth))
-
-        x_since = node.get("x-since-version") or raw.get("x-since-version")
-        x_ftype = node.get("x-field-type") or raw.get("x-field-type")
-        x_tag = node.get("x-tag") or raw.get("x-tag")
-
-        attrs.append({
-            "name": clean_name(name),
-            "type": ptype or "object",
-            "description": description,
-            "examples": examples if isinstance(examples, list) else [examples],
-            "xSinceVersion": x_since,
-            "xFieldType": x_ftype,
-            "xTag": x_tag,
-            "children": children
-        })
-
-    def build_attr(name: str, node: Dict[str, Any], owner: str, visited_tuple: Tuple[str, ...], dpth: int) -> Dict[str, Any]:
-        ptype = node.get("type", "object")
-        description = normalize_desc(node.get("description"), name)
-        examples = node.get("examples") or []
-        children: List[Dict[str, Any]] = []
-
-        if "$ref" in node:
-            r = ref_name(node["$ref"])
-            if dpth < 2:
-                child_schema = resolve_schema(r, visited_tuple + (owner,), dpth + 1)
-                children = child_schema.get("attributes", [])
-            else:
-                children = [{"name": f"(ref) {r}", "type": "object", "description": "Reference (collapsed)", "examples": []}]
-            ptype = r
-
-        if node.get("properties"):
-            for subname, subnode in node.get("properties").items():
-                children.append(build_attr(subname, subnode, owner, visited_tuple, dpth))
-
-        if ptype == "array" or node.get("type") == "array":
-            items = node.get("items", {})
-            it_type = items.get("type", "object")
-            if "$ref" in items:
-                r = ref_name(items["$ref"])
-                ptype = f"array of {r}"
-                if dpth < 2:
-                    child_schema = resolve_schema(r, visited_tuple + (owner,), dpth + 1)
-                    children = child_schema.get("attributes", [])
-                else:
-                    children = [{"name": f"(ref) {r}", "type": "object", "description": "Reference (collapsed)", "examples": []}]
-            else:
-                ptype = f"array of {it_type}"
-
-        return {
-            "name": clean_name(name),
-            "type": ptype,
-            "description": description,
-            "examples": examples if isinstance(examples, list) else [examples],
-            "children": children
-        }
-
-    for pname, pnode in (raw.get("properties") or {}).items():
-        add_property(pname, pnode)
+    raw_since = raw.get("x-since-version")
+    raw_ftype = raw.get("x-field-type")
+    raw_tag = raw.get("x-tag")
+    # Ancestors seen by everything this schema references, including itself
+    ancestors = visited | {schema_name}
+    props = raw.get("properties") or {}
+    for pname, pnode in islice(props.items(), MAX_ATTRS):
+        attr = _attr(pname, pnode, ancestors, depth, top_level=True)
+        attr["xSinceVersion"] = pnode.get("x-since-version") or raw_since
+        attr["xFieldType"] = pnode.get("x-field-type") or raw_ftype
+        attr["xTag"] = pnode.get("x-tag") or raw_tag
+        attrs.append(attr)
+    if len(props) > MAX_ATTRS:
+        attrs.append(_truncated_row(len(props) - MAX_ATTRS))
 
     if "allOf" in raw and isinstance(raw["allOf"], list):
         for member in raw["allOf"]:
             if "$ref" in member:
                 base = ref_name(member["$ref"])
-                if depth < 2:
-                    child = resolve_schema(base, visited + (schema_name,), depth + 1)
+                if depth < MAX_DEPTH:
+                    child = resolve_schema(base, ancestors, depth + 1)
                     attrs.append({
                         "name": f"(allOf) {clean_name(base)}",
                         "type": "object",
                         "description": f"Inherits from {base}.",
                         "examples": [],
-                        "children": child.get("attributes", [])
+                        "children": child.get("attributes", ())
                     })
                 else:
                     attrs.append({"name": f"(allOf) {clean_name(base)}", "type": "object", "description": "Inheritance (collapsed).", "examples": [], "children":[]})
@@ -208,37 +279,82 @@ def resolve_schema(schema_name: str, visited: Optional[Tuple[str, ...]] = None,
         "title": title,
         "type": stype,
         "description": desc,
-        "xSinceVersion": raw.get("x-since-version"),
-        "xFieldType": raw.get("x-field-type"),
-        "xTag": raw.get("x-tag"),
-        "attributes": attrs
+        "xSinceVersion": raw_since,
+        "xFieldType": raw_ftype,
+        "xTag": raw_tag,
+        "attributes": tuple(attrs)
     }
 
-# ---------- Recursive $ref finder ----------
-def find_all_refs(node: dict) -> List[str]:
-    refs = []
-    if not isinstance(node, dict):
-        return refs
-    if "$ref" in node:
-        refs.append(ref_name(node["$ref"]))
-    if "items" in node and isinstance(node["items"], dict):
-        refs.extend(find_all_refs(node["items"]))
-    if "properties" in node:
-        for p in node["properties"].values():
-            refs.extend(find_all_refs(p))
-    for key in ("allOf", "oneOf", "anyOf"):
-        if key in node and isinstance(node[key], list):
-            for item in node[key]:
-                refs.extend(find_all_refs(item))
+# ---------- $ref finder ----------
+def find_all_refs(node: dict) -> set:
+    refs = set()
+    stack = [node]
+    while stack:
+        n = stack.pop()
+        if not isinstance(n, dict):
+            continue
+        r = n.get("$ref")
+        if r:
+            refs.add(ref_name(r))
+        items = n.get("items")
+        if isinstance(items, dict):
+            stack.append(items)
+        props = n.get("properties")
+        if isinstance(props, dict):
+            stack.extend(props.values())
+        for key in ("allOf", "oneOf", "anyOf"):
+            lst = n.get(key)
+            if isinstance(lst, list):
+                stack.extend(lst)
     return refs
 
-# ---------- API ----------
-@app.get("/health")
-def health():
-    return {"status": "ok"}
+@lru_cache(maxsize=1)
+def get_ref_index() -> Tuple[Dict[str, List[str]], Dict[str, List[str]]]:
+    """Forward ($ref targets per schema) and reverse (referrers per schema) indexes.
+
+    Both are plain lists in a stable order, so payloads serialize identically
+    across processes regardless of hash seed.
+    """
+    forward: Dict[str, List[str]] = {}
+    reverse: Dict[str, List[str]] = {}
+    for name, schema in get_components().items():
+        targets = sorted(find_all_refs(schema))
+        forward[name] = targets
+        for target in targets:
+            if target != name:
+                reverse.setdefault(target, []).append(name)
+    return forward, reverse
+
+@lru_cache(maxsize=None)
+def _reachable(name: str, hops: int) -> FrozenSet[str]:
+    """Schemas reachable from `name` through at most `hops` $ref edges."""
+    if hops <= 0:
+        return frozenset()
+    forward = get_ref_index()[0]
+    reached = set()
+    for target in forward.get(name, ()):
+        reached.add(target)
+        reached |= _reachable(target, hops - 1)
+    return frozenset(reached)
+
+def schema_payload(name: str) -> bytes:
+    """Fully resolved schema with relationships, serialized."""
+    forward, reverse = get_ref_index()
+    resolved = dict(resolve_schema(name))
+
+    refs = forward.get(name, [])
+    ref_by = reverse.get(name, [])
 
-@app.get("/tree")
-def get_tree():
+    resolved["references"] = refs
+    resolved["referencedBy"] = ref_by
+    resolved["relationshipSummary"] = {
+        "referencedByCount": len(ref_by),
+        "referencesCount": len(refs)
+    }
+
+    return orjson.dumps(resolved)
+
+def build_tree() -> List[Dict[str, Any]]:
     comps = get_components()
     nodes = []
     for name, sch in comps.items():
@@ -253,12 +369,14 @@ def get_tree():
     nodes.sort(key=lambda x: x["text"].lower())
     return nodes
 
-# ---------- ✅ Fixed Versions Endpoint ----------
-@app.get("/versions")
-def get_versions():
+def version_key(s: str) -> Tuple[Tuple[int, Any], ...]:
+    # Numeric parts sort before text parts so mixed versions ("1.a", "1.2") never compare int to str
+    return tuple((0, int(p)) if p.isdigit() else (1, p) for p in s.split("."))
+
+def build_versions() -> List[str]:
     """Return all unique 'x-since-version' from schemas, fallback to info.version"""
     data = read_json()
-    comps = deep_get(data, ["components", "schemas"], {}) or {}
+    comps = get_components()
     versions_set = set()
 
     # Collect all x-since-version from schemas
@@ -273,73 +391,180 @@ def get_versions():
         versions_set.add(str(info_version))
 
     # Return sorted versions (numerical sorting for versions like 1.2, 1.10)
-    def version_key(s):
-        return [int(p) if p.isdigit() else p for p in s.split(".")]
-    
     return sorted(versions_set, key=version_key)
 
-@app.get("/schema/{name}")
-def get_schema(name: str):
-    comps = get_components()
-    if name not in comps:
-        raise HTTPException(404, detail=f"Schema '{name}' not found")
-
-    resolved = resolve_schema(name)
+def build_search_rows() -> List[Tuple[str, str, str]]:
+    """(id, text, lowercased haystack) per schema, sorted like the search results."""
+    rows = []
+    for name, sch in get_components().items():
+        get = sch.get
+        title = get("title")
+        hay = " ".join(filter(None, (
+            name,
+            title,
+            get("description"),
+            get("x-tag"),
+            get("x-field-type"),
+        ))).lower()
+        rows.append((name, title or name, hay))
+    rows.sort(key=lambda r: r[1].lower())
+    return rows
+
+# ---------- Compiled payloads ----------
+# Every read-only response is resolved and serialized once at startup, so the
+# request path is a dict lookup plus a bytes send.
+_schema_blob: Dict[str, bytes] = {}
+_schema_gz: Dict[str, bytes] = {}
+_schema_etag: Dict[str, str] = {}
+_tree_blob: bytes = b"[]"
+_tree_gz: Optional[bytes] = None
+_versions_blob: bytes = b"[]"
+_search_rows: List[Tuple[str, str, str]] = []
+
+def gzip_blob(blob: bytes) -> Optional[bytes]:
+    """Pre-compressed copy of a payload, or None when it is too small to bother."""
+    if len(blob) < GZIP_MIN_SIZE:
+        return None
+    return gzip.compress(blob, compresslevel=9)
+
+def make_etag(blob: bytes) -> str:
+    # Weak: the gzip and identity encodings of a payload share the tag
+    return f'W/"{hashlib.blake2b(blob, digest_size=8).hexdigest()}"'
+
+def _opaque_tag(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match check using weak comparison; `*` matches any current representation."""
+    inm = request.headers.get("if-none-match")
+    if not inm:
+        return False
+    if inm.strip() == "*":
+        return True
+    opaque = _opaque_tag(etag)
+    return any(_opaque_tag(t) == opaque for t in inm.split(","))
+
+def json_response(request: Request, blob: bytes, blob_gz: Optional[bytes], etag: Optional[str] = None) -> Response:
+    headers: Dict[str, str] = {}
+    if blob_gz is not None:
+        headers["Vary"] = "Accept-Encoding"
+    if etag is not None:
+        headers["ETag"] = etag
+        headers["Cache-Control"] = "public, max-age=300"
+        if etag_matches(request, etag):
+            return Response(status_code=304, headers=headers)
+    if blob_gz is not None and accepts_gzip(request.headers.get("accept-encoding", "")):
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=blob_gz, media_type="application/json", headers=headers)
+    return Response(content=blob, media_type="application/json", headers=headers)
+
+@app.on_event("startup")
+def compile_payloads():
+    global _tree_blob, _tree_gz, _versions_blob, _search_rows
+    _schema_blob.clear()
+    _schema_gz.clear()
+    _schema_etag.clear()
+    for name in get_components():
+        blob = schema_payload(name)
+        _schema_blob[name] = blob
+        _schema_etag[name] = make_etag(blob)
+        blob_gz = gzip_blob(blob)
+        if blob_gz is not None:
+            _schema_gz[name] = blob_gz
+    _tree_blob = orjson.dumps(build_tree())
+    _tree_gz = gzip_blob(_tree_blob)
+    _versions_blob = orjson.dumps(build_versions())
+    _search_rows = build_search_rows()
+    # Only the encoded payloads are needed from here on
+    _resolve_core.cache_clear()
+    _reachable.cache_clear()
+    get_ref_index.cache_clear()
 
-    refs = list(set(find_all_refs(comps[name])))
+# ---------- API ----------
+@app.get("/health")
+async def health():
+    return {"status": "ok"}
 
-    ref_by = []
-    for other, schema in comps.items():
-        if other == name:
-            continue
-        if name in find_all_refs(schema):
-            ref_by.append(other)
-    ref_by = list(set(ref_by))
+@app.get("/tree")
+async def get_tree(request: Request):
+    return json_response(request, _tree_blob, _tree_gz)
 
-    resolved["references"] = refs
-    resolved["referencedBy"] = ref_by
-    resolved["relationshipSummary"] = {
-        "referencedByCount": len(ref_by),
-        "referencesCount": len(refs)
-    }
+# ---------- ✅ Fixed Versions Endpoint ----------
+@app.get("/versions")
+async def get_versions():
+    return Response(content=_versions_blob, media_type="application/json")
 
-    return resolved
+@app.get("/schema/{name}")
+async def get_schema(name: str, request: Request):
+    blob = _schema_blob.get(name)
+    if blob is None:
+        raise HTTPException(404, detail=f"Schema '{name}' not found")
+    return json_response(request, blob, _schema_gz.get(name), _schema_etag[name])
 
 @app.get("/search")
-def search(q: str = ""):
+async def search(q: str = ""):
     q = (q or "").strip().lower()
-    comps = get_components()
-    results = []
     if not q:
-        return results
-    for name, sch in comps.items():
-        hay = " ".join(filter(None, [
-            name,
-            sch.get("title", ""),
-            sch.get("description", ""),
-            sch.get("x-tag", ""),
-            sch.get("x-field-type", ""),
-        ])).lower()
-        if q in hay:
-            results.append({"id": name, "text": sch.get("title") or name})
-    results.sort(key=lambda x: x["text"].lower())
-    return results
+        return []
+    return [{"id": name, "text": text} for name, text, hay in _search_rows if q in hay]
 
 # ---------- Static UI ----------
 STATIC_DIR = Path(__file__).parent / "static"
 STATIC_DIR.mkdir(exist_ok=True)
 
 INDEX_FILE = STATIC_DIR / "index.html"
+_INDEX_HTML: Optional[bytes] = None
+_INDEX_ETAG: Optional[str] = None
+
+# Content-hashed filenames such as app.3f9a1c2b.js or app-3f9a1c2b.css; the hash
+# must contain a hex letter so date-stamped names (report-20241015.csv) don't match
+_FINGERPRINT_RE = re.compile(r"[.-](?=[0-9]*[a-f])[0-9a-f]{8,}\.[A-Za-z0-9]+$")
+
+class CachedStatic(StaticFiles):
+    """StaticFiles that lets browsers keep fingerprinted assets for a year.
+
+    Everything else is cached briefly and revalidated with the ETag and
+    Last-Modified headers StaticFiles already sends.
+    """
+
+    async def get_response(self, path: str, scope):
+        resp = await super().get_response(path, scope)
+        if _FINGERPRINT_RE.search(path):
+            resp.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        else:
+            resp.headers["Cache-Control"] = "public, max-age=60, must-revalidate"
+        return resp
+
+@app.on_event("startup")
+def load_index():
+    global _INDEX_HTML, _INDEX_ETAG
+    _INDEX_HTML = INDEX_FILE.read_bytes() if INDEX_FILE.exists() else None
+    _INDEX_ETAG = make_etag(_INDEX_HTML) if _INDEX_HTML else None
 
 @app.get("/", response_class=HTMLResponse)
-def index():
-    if INDEX_FILE.exists():
-        return INDEX_FILE.read_text(encoding="utf-8")
+async def index(request: Request):
+    if _INDEX_HTML is not None:
+        headers = {"ETag": _INDEX_ETAG, "Cache-Control": "public, max-age=60"}
+        if etag_matches(request, _INDEX_ETAG):
+            return Response(status_code=304, headers=headers)
+        return HTMLResponse(_INDEX_HTML, headers=headers)
     return HTMLResponse(f"<h1>{APP_TITLE}</h1><p>UI not found.</p>", status_code=200)
 
-app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
+app.mount("/static", CachedStatic(directory=str(STATIC_DIR)), name="static")
 
 # ---------- Run ----------
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("app:app", host="127.0.0.1", port=8000, reload=True)
+    if os.environ.get("APP_RELOAD") == "1":
+        # Development: auto-reload is single-process and uses the default loop
+        uvicorn.run("app:app", host="127.0.0.1", port=8000, reload=True)
+    else:
+        uvicorn.run(
+            "app:app",
+            host="127.0.0.1",
+            port=8000,
+            loop="uvloop",
+            http="httptools",
+            workers=max(1, _env_int("WEB_CONCURRENCY", os.cpu_count() or 1)),
+        )